@@ -0,0 +1,74 @@
+"""
+Shared HTTP helpers for the ur-mavrouter tests
+Used by the test scripts and by conftest.py
+"""
+
+import json
+import os
+import socket
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+BASE_URL = "http://127.0.0.1:5000"
+
+# Reads answer well within this on loopback, so a hung request fails fast; the
+# router serves one request at a time, so only use it where no state change
+# can be in flight (the serial worker, or polls that retry)
+LOOPBACK_TIMEOUT = float(os.environ.get("HTTP_TEST_TIMEOUT", "0.5"))
+# State changes wait on router threads: extension stop/delete wait up to 1 s
+# for the extension mainloop and then join its thread for up to 5 s
+ACTION_TIMEOUT = float(os.environ.get("HTTP_TEST_ACTION_TIMEOUT", "10"))
+# Set HTTP_TEST_VERBOSE=1 to dump every response body
+VERBOSE = os.environ.get("HTTP_TEST_VERBOSE", "0") != "0"
+
+MAINLOOP_URL = f"{BASE_URL}/api/threads/mainloop"
+# Mainloop control endpoints, built once instead of on every request
+MAINLOOP_ACTION_URLS = {
+    action: f"{MAINLOOP_URL}/{action}" for action in ("start", "stop", "pause", "resume")
+}
+
+# Probe idle pooled sockets so a dead connection is noticed before it is reused
+SOCKET_OPTIONS = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+for _name, _value in (("TCP_KEEPIDLE", 30), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 3)):
+    if hasattr(socket, _name):
+        SOCKET_OPTIONS.append((socket.IPPROTO_TCP, getattr(socket, _name), _value))
+
+class KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled connections have TCP keepalive enabled"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = SOCKET_OPTIONS
+        super().init_poolmanager(*args, **kwargs)
+
+def new_session():
+    """Create a keep-alive session that reuses pooled loopback connections"""
+    session = requests.Session()
+    session.trust_env = False
+    session.mount("http://", KeepAliveAdapter(pool_connections=4, pool_maxsize=32,
+                                              max_retries=0, pool_block=True))
+    return session
+
+# Shared keep-alive session for the standalone test scripts
+SESSION = new_session()
+
+def dump_response(response):
+    """Print a response body in verbose mode, compacted when it is JSON"""
+    if not VERBOSE:
+        return
+    body = response.content
+    try:
+        print(f"Response: {json.dumps(json.loads(body), separators=(',', ':'))}")
+    except ValueError:
+        print(f"Response: {body.decode(errors='replace')}")
+
+def get_mainloop_info(session=SESSION, timeout=LOOPBACK_TIMEOUT):
+    """Fetch the mainloop thread record, returning (ok, thread_info)"""
+    try:
+        response = session.get(MAINLOOP_URL, timeout=timeout)
+        if response.status_code != 200:
+            return False, None
+        return True, response.json()["threads"]["mainloop"]
+    except (requests.exceptions.RequestException, ValueError, KeyError, TypeError):
+        return False, None
@@ -0,0 +1,232 @@
+"""
+Shared pytest configuration for the ur-mavrouter HTTP tests
+
+The router is built and started once per pytest run (unless one is already
+serving on port 5000) and shared by every test module and xdist worker.
+"""
+
+import os
+import socket
+import subprocess
+import time
+import warnings
+from pathlib import Path
+
+import pytest
+import requests
+
+from _common import (ACTION_TIMEOUT, BASE_URL, LOOPBACK_TIMEOUT, MAINLOOP_ACTION_URLS,
+                     get_mainloop_info, new_session)
+HTTP_ADDRESS = ("127.0.0.1", 5000)
+STARTUP_TIMEOUT = 30.0
+ROUTER_LOG = Path("/tmp/ur-mavrouter.log")
+
+THREAD_RUNNING = 1
+THREAD_PAUSED = 2
+THREAD_STOPPED = 3
+
+PKG_SRC = Path(__file__).resolve().parent.parent / "pkg_src"
+ROUTER_BINARY = PKG_SRC / "build" / "ur-mavrouter"
+SOURCE_SUFFIXES = (".c", ".cpp", ".h", ".hpp", ".tpp", ".in", "CMakeLists.txt")
+ROUTER_ARGS = [
+    "--json-conf-file", "config/router-config.json",
+    "--stats-conf-file", "config/statistics-only-config.json",
+    "--http-conf-file", "config/http-server-config.json",
+]
+
+
+def _router_needs_build():
+    """Return True when the router binary is missing or older than any source file"""
+    try:
+        built = ROUTER_BINARY.stat().st_mtime
+    except FileNotFoundError:
+        return True
+
+    for root, dirs, files in os.walk(PKG_SRC):
+        dirs[:] = [d for d in dirs if d != "build"]
+        for name in files:
+            if name.endswith(SOURCE_SUFFIXES) and os.path.getmtime(os.path.join(root, name)) > built:
+                return True
+    return False
+
+
+def _port_open():
+    """Return True when something accepts TCP connections on the HTTP port"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.settimeout(0.05)
+        return s.connect_ex(HTTP_ADDRESS) == 0
+
+
+def _router_ready(session):
+    """Return True when the router HTTP server answers on the root endpoint"""
+    if not _port_open():
+        return False
+    try:
+        return session.get(f"{BASE_URL}/", timeout=LOOPBACK_TIMEOUT).status_code == 200
+    except requests.exceptions.RequestException:
+        return False
+
+
+def _wait_for_router(session, timeout=STARTUP_TIMEOUT, process=None):
+    """Poll the router with exponential backoff until it answers or time runs out
+
+    When the router process is given, stop waiting as soon as it has exited.
+    """
+    deadline = time.monotonic() + timeout
+    delay = 0.005
+    while time.monotonic() < deadline:
+        if _router_ready(session):
+            return True
+        if process is not None and process.poll() is not None:
+            return False
+        time.sleep(delay)
+        delay = min(delay * 2, 0.1)
+    return False
+
+
+def _mainloop_state(session):
+    """Return the mainloop thread state code, or None when it cannot be read"""
+    ok, info = get_mainloop_info(session)
+    return info.get("state") if ok else None
+
+
+def _restore_mainloop(session, state):
+    """Drive the mainloop thread back to a previously recorded state"""
+    if state not in (THREAD_RUNNING, THREAD_PAUSED, THREAD_STOPPED):
+        # Created and error are not states the control endpoints can lead back to
+        warnings.warn(pytest.PytestWarning(f"mainloop started in state {state}, not restoring it"))
+        return
+
+    current = _mainloop_state(session)
+    if current == state:
+        return
+
+    if state == THREAD_RUNNING:
+        actions = ["resume"] if current == THREAD_PAUSED else ["start"]
+    elif state == THREAD_PAUSED:
+        actions = ["pause"] if current == THREAD_RUNNING else ["start", "pause"]
+    else:
+        actions = ["stop"]
+
+    for action in actions:
+        response = session.post(MAINLOOP_ACTION_URLS[action], timeout=ACTION_TIMEOUT)
+        if response.status_code != 200:
+            pytest.fail(f"Restoring the mainloop: {action} returned {response.status_code}",
+                        pytrace=False)
+
+    # The control endpoints return before the thread has switched state
+    deadline = time.monotonic() + ACTION_TIMEOUT
+    delay = 0.005
+    while True:
+        current = _mainloop_state(session)
+        if current == state:
+            return
+        if time.monotonic() >= deadline:
+            pytest.fail(f"Restoring the mainloop: state is {current}, expected {state}",
+                        pytrace=False)
+        time.sleep(delay)
+        delay = min(delay * 2, 0.1)
+
+
+def pytest_addoption(parser):
+    parser.addoption("--ext-name", default="test_extension_1",
+                     help="Extension name used by the extension endpoint tests")
+
+
+def pytest_sessionstart(session):
+    """Build and start the router, unless one is already running"""
+    # xdist workers share the router started by the controller process
+    if hasattr(session.config, "workerinput") or session.config.option.collectonly:
+        return
+
+    with new_session() as http:
+        if _router_ready(http):
+            return
+
+    if _router_needs_build():
+        try:
+            subprocess.run(["make", "-C", str(PKG_SRC), f"-j{os.cpu_count() or 1}"], check=True)
+        except (OSError, subprocess.CalledProcessError) as e:
+            pytest.exit(f"Failed to build ur-mavrouter: {e}", returncode=1)
+
+    # Send the router output to a file: nothing drains a pipe during the run
+    session.config.router_log = open(ROUTER_LOG, "wb")
+    try:
+        session.config.router_process = subprocess.Popen(
+            [str(ROUTER_BINARY), *ROUTER_ARGS],
+            cwd=PKG_SRC,
+            stdout=session.config.router_log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+    except OSError as e:
+        session.config.router_log.close()
+        pytest.exit(f"Failed to start ur-mavrouter ({ROUTER_BINARY}): {e}", returncode=1)
+
+    # Wait here rather than in the workers: only this process can see the router exit
+    process = session.config.router_process
+    with new_session() as http:
+        if not _wait_for_router(http, process=process):
+            if process.poll() is not None:
+                reason = f"exited during startup with status {process.returncode}"
+            else:
+                reason = f"did not answer on port 5000 within {STARTUP_TIMEOUT:.0f} s"
+            pytest.exit(f"ur-mavrouter {reason}, see {ROUTER_LOG}", returncode=1)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Stop the router if this pytest run started it"""
+    process = getattr(session.config, "router_process", None)
+    if process is None:
+        return
+
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+    session.config.router_log.close()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def router():
+    """Wait for the shared router to accept HTTP requests"""
+    with new_session() as http:
+        if not _wait_for_router(http):
+            pytest.exit(f"ur-mavrouter HTTP server is not reachable on port 5000, see {ROUTER_LOG}",
+                        returncode=1)
+    return BASE_URL
+
+
+@pytest.fixture(scope="session")
+def session():
+    """Keep-alive HTTP session shared by every test, reusing one pooled connection"""
+    http = new_session()
+    yield http
+    http.close()
+
+
+@pytest.fixture(scope="session")
+def restore_mainloop(session):
+    """Snapshot the mainloop thread state once and restore it after the last test"""
+    state = _mainloop_state(session)
+    yield state
+    if state is not None:
+        _restore_mainloop(session, state)
+
+
+@pytest.fixture
+def ext_name(request):
+    """Extension name the add/status/start/stop/delete tests operate on"""
+    return request.config.getoption("--ext-name")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    """Put every serial test in one xdist group so --dist loadgroup keeps them together"""
+    # Runs before pytest-xdist reads the group markers
+    for item in items:
+        if item.get_closest_marker("serial"):
+            item.add_marker(pytest.mark.xdist_group("serial"))
+
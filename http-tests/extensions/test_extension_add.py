@@ -5,66 +5,62 @@ Test extension add endpoint
 POST /api/extensions/add
 """
 
+import pytest
 import requests
+import os
 import sys
-import json
-import argparse
 
-BASE_URL = "http://0.0.0.0:5000"
+# _common lives one level up; make it importable from any working directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from _common import ACTION_TIMEOUT, BASE_URL, dump_response
 
-def test_add_extension(name, ext_type, address, port, extension_point):
+pytestmark = [pytest.mark.serial, pytest.mark.order(1)]
+
+def _delete_extension(session, name):
+    """Remove an extension added only for this module, ignoring failures"""
+    try:
+        session.delete(f"{BASE_URL}/api/extensions/{name}", timeout=ACTION_TIMEOUT)
+    except requests.exceptions.RequestException:
+        pass
+
+# The udp extension is the one the stop/start/delete tests go on to use; the
+# tcp one gets its own name so it is not rejected as a duplicate
+@pytest.mark.parametrize("ext_type,name_suffix,port,extension_point", [
+    ("udp", "", 44100, "udp-extension-point-1"),
+    ("tcp", "_tcp", 44101, "tcp-extension-point-1"),
+])
+def test_add_extension(request, session, ext_name, ext_type, name_suffix, port, extension_point):
     """Test POST /api/extensions/add - Add new extension"""
+    name = ext_name + name_suffix
     print(f"Testing POST /api/extensions/add with name={name}...")
     
     # Extension configuration
     extension_config = {
         "name": name,
         "type": ext_type,
-        "address": address,
+        "address": "127.0.0.1",
         "port": port,
         "assigned_extension_point": extension_point
     }
     
-    try:
-        response = requests.post(
-            f"{BASE_URL}/api/extensions/add",
-            json=extension_config,
-            headers={"Content-Type": "application/json"},
-            timeout=5
-        )
-        
-        if response.status_code in [200, 201]:
-            print(f"✅ PASSED: Extension added successfully")
-            try:
-                data = response.json()
-                print(f"Response: {json.dumps(data, indent=2)}")
-            except:
-                print(f"Response: {response.text}")
-            return True
-        elif response.status_code == 400:
-            print(f"⚠️  WARNING: Extension may already exist or config invalid")
-            print(f"Response: {response.text}")
-            return True
-        else:
-            print(f"❌ FAILED: Unexpected status {response.status_code}")
-            print(f"Response: {response.text}")
-            return False
-        
-    except requests.exceptions.RequestException as e:
-        print(f"❌ FAILED: Request error - {e}")
-        return False
-
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description='Test extension add endpoint')
-    parser.add_argument('--name', type=str, default='test_extension_1', help='Extension name')
-    parser.add_argument('--type', type=str, default='udp', help='Extension type (udp/tcp)')
-    parser.add_argument('--address', type=str, default='127.0.0.1', help='Extension address')
-    parser.add_argument('--port', type=int, default=44100, help='Extension port')
-    parser.add_argument('--extension-point', type=str, default='udp-extension-point-1', 
-                        help='Assigned extension point')
-    
-    args = parser.parse_args()
+    response = session.post(
+        f"{BASE_URL}/api/extensions/add",
+        json=extension_config,
+        headers={"Content-Type": "application/json"},
+        timeout=ACTION_TIMEOUT
+    )
     
-    success = test_add_extension(args.name, args.type, args.address, args.port, args.extension_point)
+    if response.status_code == 400:
+        print(f"⚠️  WARNING: Extension may already exist or config invalid")
+        print(f"Response: {response.text}")
+        return
     
-    sys.exit(0 if success else 1)
+    assert response.status_code in [200, 201], \
+        f"Unexpected status {response.status_code}: {response.text}"
+    if name_suffix:
+        request.addfinalizer(lambda: _delete_extension(session, name))
+    print(f"✅ PASSED: Extension added successfully")
+    dump_response(response)
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, *sys.argv[1:]]))
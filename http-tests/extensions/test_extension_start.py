@@ -5,51 +5,34 @@ Test extension start endpoint
 POST /api/extensions/start/:name
 """
 
-import requests
+import pytest
+import os
 import sys
-import json
-import argparse
 
-BASE_URL = "http://0.0.0.0:5000"
+# _common lives one level up; make it importable from any working directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from _common import ACTION_TIMEOUT, BASE_URL, dump_response
 
-def test_start_extension(extension_name):
+pytestmark = [pytest.mark.serial, pytest.mark.order(3)]
+
+def test_start_extension(session, ext_name):
     """Test POST /api/extensions/start/:name - Start extension"""
-    print(f"Testing POST /api/extensions/start/{extension_name}...")
-
-    try:
-        response = requests.post(
-            f"{BASE_URL}/api/extensions/start/{extension_name}",
-            timeout=5
-        )
-
-        if response.status_code == 200:
-            print(f"✅ PASSED: Extension '{extension_name}' started successfully")
-            try:
-                data = response.json()
-                print(f"Response: {json.dumps(data, indent=2)}")
-            except:
-                print(f"Response: {response.text}")
-            return True
-        elif response.status_code == 404:
-            print(f"⚠️  WARNING: Extension '{extension_name}' not found")
-            print(f"Response: {response.text}")
-            return True
-        else:
-            print(f"❌ FAILED: Unexpected status {response.status_code}")
-            print(f"Response: {response.text}")
-            return False
-
-    except requests.exceptions.RequestException as e:
-        print(f"❌ FAILED: Request error - {e}")
-        return False
+    print(f"Testing POST /api/extensions/start/{ext_name}...")
 
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description='Test extension start endpoint')
-    parser.add_argument('--name', type=str, default='test_extension_1',
-                        help='Extension name to start')
+    response = session.post(
+        f"{BASE_URL}/api/extensions/start/{ext_name}",
+        timeout=ACTION_TIMEOUT
+    )
 
-    args = parser.parse_args()
+    if response.status_code == 404:
+        print(f"⚠️  WARNING: Extension '{ext_name}' not found")
+        print(f"Response: {response.text}")
+        return
 
-    success = test_start_extension(args.name)
+    assert response.status_code == 200, \
+        f"Unexpected status {response.status_code}: {response.text}"
+    print(f"✅ PASSED: Extension '{ext_name}' started successfully")
+    dump_response(response)
 
-    sys.exit(0 if success else 1)
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, *sys.argv[1:]]))
@@ -6,82 +6,49 @@ GET /api/extensions/status
 GET /api/extensions/status/:name
 """
 
-import requests
+import pytest
+import os
 import sys
-import json
-import argparse
 
-BASE_URL = "http://0.0.0.0:5000"
+# _common lives one level up; make it importable from any working directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from _common import BASE_URL, LOOPBACK_TIMEOUT, dump_response
 
-def test_get_all_extensions_status():
+# Reads the lifecycle extension; runs on the serial worker before it is added
+pytestmark = [pytest.mark.serial, pytest.mark.order(0)]
+
+def test_get_all_extensions_status(session):
     """Test GET /api/extensions/status - Get all extensions status"""
     print("Testing GET /api/extensions/status...")
     
-    try:
-        response = requests.get(f"{BASE_URL}/api/extensions/status", timeout=5)
-        
-        if response.status_code != 200:
-            print(f"❌ FAILED: Expected status 200, got {response.status_code}")
-            return False
-        
-        if "application/json" not in response.headers.get("Content-Type", ""):
-            print(f"❌ FAILED: Expected application/json content type")
-            return False
-        
-        try:
-            data = response.json()
-            if not isinstance(data, list):
-                print(f"❌ FAILED: Expected array response")
-                return False
-            
-            print(f"✅ PASSED: GET all extensions status - {len(data)} extensions found")
-            print(f"Response: {json.dumps(data, indent=2)}")
-            return True
-            
-        except json.JSONDecodeError:
-            print(f"❌ FAILED: Invalid JSON response")
-            return False
-        
-    except requests.exceptions.RequestException as e:
-        print(f"❌ FAILED: Request error - {e}")
-        return False
-
-def test_get_specific_extension_status(extension_name):
-    """Test GET /api/extensions/status/:name - Get specific extension status"""
-    print(f"\nTesting GET /api/extensions/status/{extension_name}...")
+    response = session.get(f"{BASE_URL}/api/extensions/status", timeout=LOOPBACK_TIMEOUT)
     
-    try:
-        response = requests.get(f"{BASE_URL}/api/extensions/status/{extension_name}", timeout=5)
-        
-        if response.status_code == 200:
-            data = response.json()
-            print(f"✅ PASSED: GET extension status for '{extension_name}'")
-            print(f"Response: {json.dumps(data, indent=2)}")
-            return True
-        elif response.status_code == 404:
-            print(f"✅ PASSED: Extension '{extension_name}' not found (expected for new system)")
-            return True
-        else:
-            print(f"❌ FAILED: Unexpected status {response.status_code}")
-            return False
-        
-    except requests.exceptions.RequestException as e:
-        print(f"❌ FAILED: Request error - {e}")
-        return False
-
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description='Test extension status endpoints')
-    parser.add_argument('--name', type=str, help='Extension name to check status for')
-    parser.add_argument('--all', action='store_true', help='Get all extensions status')
+    assert response.status_code == 200, f"Expected status 200, got {response.status_code}"
     
-    args = parser.parse_args()
+    content_type = response.headers.get("content-type", "")
+    assert content_type.startswith("application/json"), \
+        f"Expected application/json content type, got '{content_type}'"
     
-    success = True
+    data = response.json()
+    assert isinstance(data, list), "Expected array response"
     
-    if args.all or (not args.name and not args.all):
-        success = test_get_all_extensions_status()
+    print(f"✅ PASSED: GET all extensions status - {len(data)} extensions found")
+    dump_response(response)
+
+def test_get_specific_extension_status(session, ext_name):
+    """Test GET /api/extensions/status/:name - Get specific extension status"""
+    print(f"\nTesting GET /api/extensions/status/{ext_name}...")
+    
+    response = session.get(f"{BASE_URL}/api/extensions/status/{ext_name}", timeout=LOOPBACK_TIMEOUT)
     
-    if args.name:
-        success = success and test_get_specific_extension_status(args.name)
+    if response.status_code == 404:
+        print(f"✅ PASSED: Extension '{ext_name}' not found (expected for new system)")
+        return
     
-    sys.exit(0 if success else 1)
+    assert response.status_code == 200, f"Unexpected status {response.status_code}"
+    assert isinstance(response.json(), dict), "Expected object response"
+    print(f"✅ PASSED: GET extension status for '{ext_name}'")
+    dump_response(response)
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, *sys.argv[1:]]))
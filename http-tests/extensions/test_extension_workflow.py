@@ -5,14 +5,17 @@ Comprehensive extension workflow test
 Tests the full lifecycle: add -> status -> stop -> start -> delete
 """
 
-import requests
+import pytest
+import os
 import sys
-import json
-import time
 
-BASE_URL = "http://0.0.0.0:5000"
+# _common lives one level up; make it importable from any working directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from _common import ACTION_TIMEOUT, BASE_URL, LOOPBACK_TIMEOUT, dump_response
 
-def test_extension_workflow():
+pytestmark = [pytest.mark.serial, pytest.mark.order(5)]
+
+def test_extension_workflow(session):
     """Test complete extension lifecycle"""
     print("=" * 60)
     print("Extension Workflow Test - Full Lifecycle")
@@ -30,85 +33,63 @@ def test_extension_workflow():
         "assigned_extension_point": "udp-extension-point-2"
     }
     
-    response = requests.post(
+    response = session.post(
         f"{BASE_URL}/api/extensions/add",
         json=extension_config,
         headers={"Content-Type": "application/json"},
-        timeout=5
+        timeout=ACTION_TIMEOUT
     )
     
-    if response.status_code not in [200, 201, 400]:
-        print(f"❌ FAILED: Add extension - status {response.status_code}")
-        return False
+    assert response.status_code == 200, f"Add extension - status {response.status_code}: {response.text}"
     print(f"✅ Add extension: {response.status_code}")
     
-    time.sleep(0.5)
-    
     # Step 2: Check status
     print("\n[STEP 2] Checking extension status...")
-    response = requests.get(
+    response = session.get(
         f"{BASE_URL}/api/extensions/status/{extension_name}",
-        timeout=5
+        timeout=LOOPBACK_TIMEOUT
     )
     
-    if response.status_code in [200, 404]:
-        print(f"✅ Check status: {response.status_code}")
-        if response.status_code == 200:
-            print(f"Extension data: {json.dumps(response.json(), indent=2)}")
-    else:
-        print(f"❌ FAILED: Check status - status {response.status_code}")
-        return False
-    
-    time.sleep(0.5)
+    assert response.status_code == 200, f"Check status - status {response.status_code}"
+    print(f"✅ Check status: {response.status_code}")
+    dump_response(response)
     
     # Step 3: Stop extension
+    # isRunning is already set when add/start return, so the status cannot show
+    # whether the extension mainloop is up; stop waits up to 1 s for it itself,
+    # which ACTION_TIMEOUT covers
     print("\n[STEP 3] Stopping extension...")
-    response = requests.post(
+    response = session.post(
         f"{BASE_URL}/api/extensions/stop/{extension_name}",
-        timeout=5
+        timeout=ACTION_TIMEOUT
     )
     
-    if response.status_code in [200, 404]:
-        print(f"✅ Stop extension: {response.status_code}")
-    else:
-        print(f"❌ FAILED: Stop extension - status {response.status_code}")
-        return False
-    
-    time.sleep(0.5)
+    assert response.status_code == 200, f"Stop extension - status {response.status_code}: {response.text}"
+    print(f"✅ Stop extension: {response.status_code}")
     
     # Step 4: Start extension
     print("\n[STEP 4] Starting extension...")
-    response = requests.post(
+    response = session.post(
         f"{BASE_URL}/api/extensions/start/{extension_name}",
-        timeout=5
+        timeout=ACTION_TIMEOUT
     )
     
-    if response.status_code in [200, 404]:
-        print(f"✅ Start extension: {response.status_code}")
-    else:
-        print(f"❌ FAILED: Start extension - status {response.status_code}")
-        return False
-    
-    time.sleep(0.5)
+    assert response.status_code == 200, f"Start extension - status {response.status_code}: {response.text}"
+    print(f"✅ Start extension: {response.status_code}")
     
     # Step 5: Delete extension
     print("\n[STEP 5] Deleting extension...")
-    response = requests.delete(
-        f"{BASE_URL}/api/extensions/delete/{extension_name}",
-        timeout=5
+    response = session.delete(
+        f"{BASE_URL}/api/extensions/{extension_name}",
+        timeout=ACTION_TIMEOUT
     )
     
-    if response.status_code in [200, 404]:
-        print(f"✅ Delete extension: {response.status_code}")
-    else:
-        print(f"❌ FAILED: Delete extension - status {response.status_code}")
-        return False
+    assert response.status_code == 200, f"Delete extension - status {response.status_code}: {response.text}"
+    print(f"✅ Delete extension: {response.status_code}")
     
     print("\n" + "=" * 60)
     print("✅ PASSED: Complete extension workflow test")
     print("=" * 60)
-    return True
 
 if __name__ == "__main__":
-    success = test_extension_workflow()
-    sys.exit(0 if success else 1)
+    sys.exit(pytest.main([__file__, *sys.argv[1:]]))
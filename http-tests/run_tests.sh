@@ -48,19 +48,9 @@ echo ""
 echo -e "${YELLOW}Running HTTP server tests...${NC}"
 echo "========================================="
 
-# Run main test suite
-python3 test_http_server.py || {
-    echo -e "${RED}HTTP server tests failed${NC}"
-    exit 1
-}
-
-echo ""
-echo -e "${YELLOW}Running RPC controller tests...${NC}"
-echo "========================================="
-
-# Run RPC controller tests  
-python3 test_rpc_controller.py || {
-    echo -e "${RED}RPC controller tests failed${NC}"
+# Run every test module in one pytest process
+python3 -m pytest -n auto --dist loadgroup . || {
+    echo -e "${RED}HTTP tests failed${NC}"
     exit 1
 }
 
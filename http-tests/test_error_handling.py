@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+HTTP tests for error handling
+Methods no route accepts must be answered with 404
+
+GET is not covered here: the root route is registered as a "/" prefix
+match, so the router answers every unknown GET path with the root page.
+"""
+
+import pytest
+import sys
+
+from _common import ACTION_TIMEOUT, BASE_URL
+
+
+@pytest.mark.parametrize("method,path,expect", [
+    ("POST", "/api/invalid", 404),
+    ("DELETE", "/api/nonexistent/path", 404),
+    ("POST", "/api/threads", 404),
+    ("PUT", "/status", 404),
+])
+def test_error_cases(session, method, path, expect):
+    """Test that an invalid request is rejected with the expected status"""
+    print(f"Testing {method} {path}...")
+
+    # Not serial, so this can queue behind a slow state change on the serial worker
+    response = session.request(method, f"{BASE_URL}{path}", timeout=ACTION_TIMEOUT)
+
+    assert response.status_code == expect, \
+        f"Expected status {expect}, got {response.status_code}"
+    print(f"✅ PASSED: {method} {path} returned {expect}")
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, *sys.argv[1:]]))
@@ -4,37 +4,36 @@ HTTP test for mainloop thread start operation
 Sends a start request to the mainloop thread
 """
 
+import pytest
 import requests
 import sys
 
-BASE_URL = "http://0.0.0.0:5000"
+from _common import ACTION_TIMEOUT, MAINLOOP_ACTION_URLS, SESSION
 
-def test_start_mainloop_thread():
+pytestmark = [pytest.mark.serial, pytest.mark.usefixtures("restore_mainloop")]
+
+def test_start_mainloop_thread(session):
     """Test POST /api/threads/mainloop/start - Start mainloop thread"""
     print("Sending mainloop thread start request...")
 
-    try:
-        response = requests.post(f"{BASE_URL}/api/threads/mainloop/start", timeout=10)
-
-        if response.status_code == 200:
-            print(f"✅ Request sent successfully")
-            print(f"   Status Code: {response.status_code}")
-            print(f"   Response: {response.text}")
-            return True
-        else:
-            print(f"❌ Request failed with status code: {response.status_code}")
-            return False
+    response = session.post(MAINLOOP_ACTION_URLS["start"], timeout=ACTION_TIMEOUT)
 
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Request error - {e}")
-        return False
+    assert response.status_code == 200, f"Request failed with status code: {response.status_code}"
+    print(f"✅ Request sent successfully")
+    print(f"   Status Code: {response.status_code}")
+    print(f"   Response: {response.text}")
 
 if __name__ == "__main__":
     print("=" * 60)
     print("Mainloop Thread Start Test")
     print("=" * 60)
 
-    success = test_start_mainloop_thread()
+    try:
+        test_start_mainloop_thread(SESSION)
+        success = True
+    except (AssertionError, requests.exceptions.RequestException) as e:
+        print(f"❌ {e}")
+        success = False
 
     print("\n" + "=" * 60)
     if success:
@@ -6,12 +6,13 @@ Monitors real-time availability of MAVLink endpoints and validates MAVLink compa
 """
 
 import socket
+import selectors
 import json
 import time
 import struct
 import sys
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 from enum import Enum
 
 class EndpointType(Enum):
@@ -29,6 +30,26 @@ class EndpointStatus(Enum):
 MAVLINK_V2_MAGIC = 0xFD
 # MAVLink v1.0 magic byte
 MAVLINK_V1_MAGIC = 0xFE
+MAVLINK_MAGICS = (MAVLINK_V2_MAGIC, MAVLINK_V1_MAGIC)
+# Frame size on top of the payload: header plus 2-byte CRC
+MAVLINK_V2_OVERHEAD = 12
+MAVLINK_V1_OVERHEAD = 8
+# MAVLink v2.0 incompat flag marking a signed frame, and its signature size
+MAVLINK_IFLAG_SIGNED = 0x01
+MAVLINK_SIGNATURE_LEN = 13
+# Kernel receive buffer requested per socket, to absorb bursts between wakeups
+SOCKET_RCVBUF_SIZE = 2 * 1024 * 1024
+
+# ANSI colors used by the status display
+STATUS_COLORS = {
+    EndpointStatus.DISCONNECTED: "\033[90m",  # Gray
+    EndpointStatus.CONNECTING: "\033[93m",    # Yellow
+    EndpointStatus.CONNECTED: "\033[94m",     # Blue
+    EndpointStatus.MAVLINK_VERIFIED: "\033[92m",  # Green
+    EndpointStatus.ERROR: "\033[91m"          # Red
+}
+RESET_COLOR = "\033[0m"
+BANNER = "=" * 80
 
 class MAVLinkEndpoint:
     def __init__(self, name: str, endpoint_type: str, address: str, port: int, enabled: bool = True):
@@ -43,6 +64,14 @@ class MAVLinkEndpoint:
         self.error_message = ""
         self.mavlink_messages_received = 0
         self.last_reconnect_attempt = 0
+        # Fixed status display heading, formatted once
+        self.label = f"[{name}] {self.type.value.upper()} {address}:{port}"
+        # Received bytes not yet framed into a complete MAVLink message
+        self._rx_buf = bytearray()
+        # Receive buffer reused for every read (large enough for any datagram),
+        # and a view of it for copying out a split frame without a temporary
+        self._recv_buf = bytearray(65536)
+        self._recv_view = memoryview(self._recv_buf)
         
     def connect(self) -> bool:
         """Attempt to connect to the endpoint"""
@@ -54,7 +83,7 @@ class MAVLinkEndpoint:
             
             if self.type == EndpointType.UDP:
                 self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                self.socket.settimeout(0.5)
+                self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_RCVBUF_SIZE)
                 self.socket.setblocking(False)
                 # For UDP, we consider it "connected" immediately
                 self.status = EndpointStatus.CONNECTED
@@ -62,6 +91,8 @@ class MAVLinkEndpoint:
                 
             elif self.type == EndpointType.TCP:
                 self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                # Set before connect() so the advertised TCP window can use it
+                self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_RCVBUF_SIZE)
                 self.socket.settimeout(2.0)
                 self.socket.connect((self.address, self.port))
                 self.socket.setblocking(False)
@@ -82,34 +113,118 @@ class MAVLinkEndpoint:
             except:
                 pass
             self.socket = None
+        self._rx_buf.clear()
             
-    def receive_data(self) -> bytes:
-        """Receive data from the endpoint"""
+    def receive_pending(self, max_reads: int = 64) -> Iterator[int]:
+        """Receive everything queued on the endpoint socket, up to max_reads reads
+        
+        Yields the byte count of each read, which lands at the start of the
+        endpoint's receive buffer and stays valid until the next read; pass it to
+        verify_received(). Raises ConnectionError when a TCP peer has closed the
+        connection.
+        """
         if not self.socket:
-            return b''
+            return
             
-        try:
-            if self.type == EndpointType.UDP:
-                data, _ = self.socket.recvfrom(4096)
-                return data
-            else:  # TCP
-                return self.socket.recv(4096)
-        except socket.error:
-            return b''
-            
-    def verify_mavlink(self, data: bytes) -> bool:
-        """Verify if received data contains valid MAVLink messages"""
-        if len(data) < 6:
-            return False
+        for _ in range(max_reads):
+            try:
+                if self.type == EndpointType.UDP:
+                    n, _ = self.socket.recvfrom_into(self._recv_buf)
+                else:  # TCP
+                    n = self.socket.recv_into(self._recv_buf)
+                    if n == 0:
+                        raise ConnectionError("Connection closed by peer")
+            except BlockingIOError:
+                # Socket drained
+                return
+            except socket.error:
+                if self.type == EndpointType.TCP:
+                    raise
+                return
+            yield n
             
-        # Check for MAVLink v2.0 or v1.0 magic byte
-        for i in range(len(data)):
-            if data[i] == MAVLINK_V2_MAGIC or data[i] == MAVLINK_V1_MAGIC:
-                self.mavlink_messages_received += 1
-                self.last_heartbeat = time.time()
-                self.status = EndpointStatus.MAVLINK_VERIFIED
-                return True
+    def verify_received(self, n: int, now: Optional[float] = None) -> bool:
+        """Frame the n bytes a receive_pending() read left in the receive buffer
+        
+        The bytes are framed in place; only a split TCP frame is copied out.
+        `now` is the caller's time.monotonic() reading, taken when omitted
+        """
+        return self._verify(self._recv_buf, self._recv_view, n, now)
+        
+    def verify_mavlink(self, data: bytes, now: Optional[float] = None) -> bool:
+        """Frame received data into MAVLink messages and count each complete one
+        
+        `data` is copied first when it is a memoryview, which has no find().
+        `now` is the caller's time.monotonic() reading, taken when omitted
+        """
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return self._verify(data, data, len(data), now)
+        
+    def _verify(self, src, view, end: int, now: Optional[float]) -> bool:
+        """Frame src[:end] and record any complete messages
+        
+        `view` slices the same bytes as src; the split tail of a TCP read is
+        copied out through it
+        """
+        if self.type == EndpointType.TCP and self._rx_buf:
+            # Complete the frame a previous read left split
+            buf = self._rx_buf
+            buf += view[:end]
+            frames, offset = self._frame(buf, len(buf))
+            del buf[:offset]
+        else:
+            # UDP datagrams carry whole frames; a TCP read only keeps its split tail
+            frames, offset = self._frame(src, end)
+            if self.type == EndpointType.TCP and offset < end:
+                self._rx_buf += view[offset:end]
+                
+        if frames:
+            self.mavlink_messages_received += frames
+            self.last_heartbeat = time.monotonic() if now is None else now
+            self.status = EndpointStatus.MAVLINK_VERIFIED
+            return True
         return False
+        
+    @staticmethod
+    def _frame(buf, end: int) -> Tuple[int, int]:
+        """Count the complete MAVLink frames in buf[:end]
+        
+        Returns the frame count and the offset of the first byte that may still
+        begin a frame (end when nothing is left to keep)
+        """
+        frames = 0
+        offset = 0
+        
+        while True:
+            if offset < end and buf[offset] in MAVLINK_MAGICS:
+                # Aligned stream: the next frame starts where the last one ended
+                start = offset
+            else:
+                # Resync on the next magic byte of either version (bytes.find scans in C)
+                v2 = buf.find(MAVLINK_V2_MAGIC, offset, end)
+                v1 = buf.find(MAVLINK_V1_MAGIC, offset, end)
+                if v2 == -1 and v1 == -1:
+                    return frames, end
+                start = v1 if v2 == -1 or (v1 != -1 and v1 < v2) else v2
+            
+            # Need the magic, length and (v2) incompat flags bytes
+            if end - start < 3:
+                return frames, start
+                
+            if buf[start] == MAVLINK_V2_MAGIC:
+                size = MAVLINK_V2_OVERHEAD + buf[start + 1]
+                if buf[start + 2] & MAVLINK_IFLAG_SIGNED:
+                    size += MAVLINK_SIGNATURE_LEN
+            else:
+                size = MAVLINK_V1_OVERHEAD + buf[start + 1]
+                
+            if end - start < size:
+                return frames, start
+                
+            # Jump over the whole frame instead of rescanning its bytes
+            frames += 1
+            offset = start + size
 
 class EndpointMonitor:
     def __init__(self, config_file: str):
@@ -117,6 +232,8 @@ class EndpointMonitor:
         self.endpoints: List[MAVLinkEndpoint] = []
         self.test_settings = {}
         self.running = True
+        # Readiness notification for every connected endpoint socket
+        self.selector = selectors.DefaultSelector()
         
     def load_config(self) -> bool:
         """Load endpoint configuration from JSON file"""
@@ -141,64 +258,79 @@ class EndpointMonitor:
             print(f"ERROR: Failed to load config: {e}")
             return False
             
-    def display_status(self):
+    def display_status(self, now: Optional[float] = None):
         """Display current status of all endpoints"""
-        print("\n" + "="*80)
-        print(f"MAVLink Endpoint Monitor - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print("="*80)
+        if now is None:
+            now = time.monotonic()
+        lines = [
+            "",
+            BANNER,
+            f"MAVLink Endpoint Monitor - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            BANNER,
+        ]
         
         for ep in self.endpoints:
-            status_color = {
-                EndpointStatus.DISCONNECTED: "\033[90m",  # Gray
-                EndpointStatus.CONNECTING: "\033[93m",    # Yellow
-                EndpointStatus.CONNECTED: "\033[94m",     # Blue
-                EndpointStatus.MAVLINK_VERIFIED: "\033[92m",  # Green
-                EndpointStatus.ERROR: "\033[91m"          # Red
-            }.get(ep.status, "")
-            
-            reset_color = "\033[0m"
+            status_color = STATUS_COLORS.get(ep.status, "")
             
-            print(f"\n[{ep.name}] {ep.type.value.upper()} {ep.address}:{ep.port}")
-            print(f"  Status: {status_color}{ep.status.value}{reset_color}")
+            lines.append("")
+            lines.append(ep.label)
+            lines.append(f"  Status: {status_color}{ep.status.value}{RESET_COLOR}")
             
             if ep.status == EndpointStatus.ERROR:
-                print(f"  Error: {ep.error_message}")
+                lines.append(f"  Error: {ep.error_message}")
             elif ep.status == EndpointStatus.MAVLINK_VERIFIED:
-                print(f"  MAVLink Messages: {ep.mavlink_messages_received}")
+                lines.append(f"  MAVLink Messages: {ep.mavlink_messages_received}")
                 if ep.last_heartbeat:
-                    age = time.time() - ep.last_heartbeat
-                    print(f"  Last Message: {age:.1f}s ago")
+                    age = now - ep.last_heartbeat
+                    lines.append(f"  Last Message: {age:.1f}s ago")
                     
-        print("\n" + "="*80)
+        lines.append("")
+        lines.append(BANNER)
+        # One write per refresh instead of one per line
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+        
+    def disconnect_endpoint(self, endpoint: MAVLinkEndpoint):
+        """Stop watching the endpoint socket and close it"""
+        if endpoint.socket:
+            try:
+                self.selector.unregister(endpoint.socket)
+            except (KeyError, ValueError):
+                pass
+        endpoint.close()
+        
+    def monitor_endpoint(self, endpoint: MAVLinkEndpoint, now: float, readable: bool = False):
+        """Monitor a single endpoint, receiving only when its socket is readable
         
-    def monitor_endpoint(self, endpoint: MAVLinkEndpoint):
-        """Monitor a single endpoint"""
+        `now` is the time.monotonic() reading shared by the whole loop pass
+        """
         # Check if we need to connect/reconnect
         if endpoint.status in [EndpointStatus.DISCONNECTED, EndpointStatus.ERROR]:
-            current_time = time.time()
             reconnect_delay = self.test_settings.get('reconnect_delay_seconds', 2)
             
-            if current_time - endpoint.last_reconnect_attempt >= reconnect_delay:
-                endpoint.last_reconnect_attempt = current_time
-                endpoint.connect()
+            if now - endpoint.last_reconnect_attempt >= reconnect_delay:
+                endpoint.last_reconnect_attempt = now
+                if endpoint.connect():
+                    self.selector.register(endpoint.socket, selectors.EVENT_READ, endpoint)
                 
         # If connected, try to receive and verify MAVLink data
         if endpoint.status in [EndpointStatus.CONNECTED, EndpointStatus.MAVLINK_VERIFIED]:
             try:
-                data = endpoint.receive_data()
-                if data:
-                    endpoint.verify_mavlink(data)
+                if readable:
+                    # Drain the socket so a busy stream is read once per wakeup
+                    for n in endpoint.receive_pending():
+                        endpoint.verify_received(n, now)
                     
                 # Check for timeout
                 if endpoint.last_heartbeat:
                     timeout = self.test_settings.get('heartbeat_timeout_seconds', 5)
-                    if time.time() - endpoint.last_heartbeat > timeout:
+                    if now - endpoint.last_heartbeat > timeout:
                         endpoint.status = EndpointStatus.CONNECTED
                         
             except Exception as e:
                 endpoint.error_message = str(e)
                 endpoint.status = EndpointStatus.ERROR
-                endpoint.close()
+                self.disconnect_endpoint(endpoint)
                 
     def run(self):
         """Main monitoring loop"""
@@ -210,23 +342,35 @@ class EndpointMonitor:
         print("Press Ctrl+C to stop\n")
         
         status_interval = self.test_settings.get('status_interval_seconds', 1)
+        reconnect_delay = self.test_settings.get('reconnect_delay_seconds', 2)
         last_status_time = 0
+        wait = 0
+        # The enabled set is fixed by the config; resolve it once for the loop
+        active = [ep for ep in self.endpoints if ep.enabled]
         
         try:
             while self.running:
-                current_time = time.time()
+                # Block until a socket is readable or the next deadline is due
+                if self.selector.get_map():
+                    ready = {key.data for key, _ in self.selector.select(wait)}
+                else:
+                    time.sleep(wait)
+                    ready = set()
+                # One clock reading per pass, shared by every endpoint
+                current_time = time.monotonic()
                 
                 # Monitor all endpoints
-                for endpoint in self.endpoints:
-                    if endpoint.enabled:
-                        self.monitor_endpoint(endpoint)
+                for endpoint in active:
+                    self.monitor_endpoint(endpoint, current_time, endpoint in ready)
                         
                 # Display status at regular intervals
                 if current_time - last_status_time >= status_interval:
-                    self.display_status()
+                    self.display_status(current_time)
                     last_status_time = current_time
                     
-                time.sleep(0.1)  # Small sleep to prevent CPU spinning
+                wait = max(0, last_status_time + status_interval - time.monotonic())
+                if any(ep.status in (EndpointStatus.DISCONNECTED, EndpointStatus.ERROR) for ep in active):
+                    wait = min(wait, reconnect_delay)
                 
         except KeyboardInterrupt:
             print("\n\nStopping monitor...")
@@ -234,7 +378,8 @@ class EndpointMonitor:
         finally:
             # Cleanup
             for endpoint in self.endpoints:
-                endpoint.close()
+                self.disconnect_endpoint(endpoint)
+            self.selector.close()
                 
         return 0
 